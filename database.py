@@ -3,13 +3,18 @@ Database Helper Functions
 
 MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
+The client is Motor's asyncio driver, so the helpers are coroutines and must be awaited.
 """
 
-from pymongo import MongoClient
+from bson import encode as bson_encode
+from bson.raw_bson import RawBSONDocument
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 from datetime import datetime, timezone
 import os
+import re
 from dotenv import load_dotenv
-from typing import Union
+from typing import Iterable, List, Union
 from pydantic import BaseModel
 
 # Load environment variables from .env file
@@ -22,11 +27,20 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    # One pooled client per process; fail fast on a dead primary instead of hanging 30s
+    _client = AsyncIOMotorClient(
+        database_url,
+        maxPoolSize=int(os.getenv("MONGO_POOL", "50")),
+        minPoolSize=5,
+        serverSelectionTimeoutMS=2000,
+        socketTimeoutMS=5000,
+        compressors="zstd",
+        retryReads=True,
+    )
     db = _client[database_name]
 
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -39,17 +53,96 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
 
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
+    _add_search_fields(data_dict)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+def build_phraselist(*texts: str) -> List[str]:
+    """Lowercased 2-6 word n-grams of the given texts, used for indexed phrase lookups"""
+    phrases = []
+    for text in texts:
+        words = re.findall(r"\w+", (text or "").lower())
+        for n in range(2, 7):
+            for i in range(len(words) - n + 1):
+                phrases.append(" ".join(words[i:i + n]))
+    return list(dict.fromkeys(phrases))
+
+def _add_search_fields(data_dict: dict):
+    # Denormalized so searches are exact matches on multikey indexes, not regexes
+    if isinstance(data_dict.get('tags'), list):
+        data_dict['tags_lc'] = [t.lower() for t in data_dict['tags']]
+    if isinstance(data_dict.get('summary'), str):
+        data_dict['phraselist'] = build_phraselist(data_dict.get('title'), data_dict['summary'])
+
+def _prepared(data: Union[BaseModel, dict]) -> dict:
+    if isinstance(data, BaseModel):
+        data_dict = data.model_dump(mode="json")
+    else:
+        data_dict = data.copy()
+    _add_search_fields(data_dict)
+    return data_dict
+
+def _stamped(data: Union[BaseModel, dict], now: datetime) -> dict:
+    data_dict = _prepared(data)
+    data_dict['created_at'] = now
+    data_dict['updated_at'] = now
+    return data_dict
+
+def encode_documents(items: Iterable[Union[BaseModel, dict]]) -> List[RawBSONDocument]:
+    """Pre-encode documents to BSON for repeated inserts of fixed data
+
+    No timestamps are stamped, since encoding may happen long before the insert;
+    the server-assigned ObjectId records the actual insert time.
+    """
+    return [RawBSONDocument(bson_encode(_prepared(data))) for data in items]
+
+async def create_documents(collection_name: str, items: Iterable[Union[BaseModel, dict, RawBSONDocument]]):
+    """Insert many documents with timestamps in a single round-trip"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    now = datetime.now(timezone.utc)
+    # Pre-encoded documents are sent as-is; the server assigns their _id (and so their insert time)
+    docs = [data if isinstance(data, RawBSONDocument) else _stamped(data, now) for data in items]
+
+    if not docs:
+        return []
+    # Unordered so a single duplicate key doesn't abort the rest of the batch
+    result = await db[collection_name].insert_many(docs, ordered=False)
+    return [str(_id) for _id in result.inserted_ids if _id is not None]
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None, sort: list = None):
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    # Leave _id out unless asked for so callers can return documents as-is
+    cursor = db[collection_name].find(filter_dict or {}, projection if projection is not None else {"_id": 0})
+    if sort:
+        cursor = cursor.sort(sort)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return await cursor.to_list(length=limit)
+
+async def backfill_search_fields(collection_name: str):
+    """Add search fields to documents written before they were maintained on insert; idempotent"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    missing = {"$or": [
+        {"tags": {"$type": "array"}, "tags_lc": {"$exists": False}},
+        {"summary": {"$type": "string"}, "phraselist": {"$exists": False}},
+    ]}
+    updates = []
+    async for doc in db[collection_name].find(missing, {"title": 1, "summary": 1, "tags": 1}):
+        fields = {k: v for k, v in doc.items() if k != "_id"}
+        _add_search_fields(fields)
+        updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+            k: fields[k] for k in ("tags_lc", "phraselist") if k in fields
+        }}))
+
+    if updates:
+        await db[collection_name].bulk_write(updates, ordered=False)
+    return len(updates)
@@ -1,28 +1,158 @@
+import asyncio
+import hashlib
+import logging
 import os
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import orjson
+from async_lru import alru_cache
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from pymongo.errors import ServerSelectionTimeoutError
 
-from database import db, create_document, get_documents
-from schemas import Project, Publication, BlogPost, ContactMessage
+from database import db, backfill_search_fields, build_phraselist, create_document, create_documents, encode_documents, get_documents
+from schemas import Project, Publication, BlogPost, BlogPostSummary, ContactMessage
 
-app = FastAPI(title="Muhamad Juwandi Portfolio API")
+def _fields_projection(model: type) -> Dict[str, int]:
+    """Mongo projection returning only the model's fields, so internals never leave the server"""
+    return {"_id": 0, **{name: 1 for name in model.model_fields}}
+
+def _field_defaults(model: type) -> Dict[str, Any]:
+    """Defaults for optional fields, so documents stored without them still match the schema"""
+    return {
+        name: field.get_default(call_default_factory=True)
+        for name, field in model.model_fields.items()
+        if not field.is_required()
+    }
+
+_PROJECT_FIELDS = _fields_projection(Project)
+_PUB_FIELDS = _fields_projection(Publication)
+_POST_FIELDS = _fields_projection(BlogPost)
+
+_POST_SUMMARY_FIELDS = _fields_projection(BlogPostSummary)
+
+_PROJECT_DEFAULTS = _field_defaults(Project)
+_PUB_DEFAULTS = _field_defaults(Publication)
+_POST_SUMMARY_DEFAULTS = _field_defaults(BlogPostSummary)
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="Muhamad Juwandi Portfolio API", default_response_class=ORJSONResponse)
+
+# Comma-separated allowlist. Without one, any origin is allowed with credentials
+# (Starlette echoes the request Origin when cookies are sent), the old default but unsafe.
+_cors_origins = [o.strip() for o in os.getenv("FRONTEND_ORIGIN", "").split(",") if o.strip()]
+if not _cors_origins:
+    logger.warning("FRONTEND_ORIGIN is not set; allowing credentialed CORS requests from any origin")
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=_cors_origins or ["*"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,
 )
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
+# Small TTL cache for values that are polled often but change rarely
+_CACHE_TTL = 5.0
+_ttl_cache: Dict[str, Tuple[float, Any]] = {}
+
+async def _cached(key: str, probe: Callable[[], Awaitable[Any]]) -> Any:
+    now = time.monotonic()
+    hit = _ttl_cache.get(key)
+    if hit is not None and now - hit[0] < _CACHE_TTL:
+        return hit[1]
+    value = await probe()
+    _ttl_cache[key] = (now, value)
+    return value
+
+# Public lists are the same for every visitor, so let browsers and CDNs keep them
+_CACHE_CONTROL = "public, max-age=60, s-maxage=600, stale-while-revalidate=300"
+
+def _listing(docs: list, defaults: Optional[Dict[str, Any]] = None) -> Tuple[str, bytes]:
+    """Serialize documents once and tag them with a weak ETag of exactly those bytes"""
+    body = orjson.dumps([{**defaults, **d} for d in docs] if defaults else docs)
+    return 'W/"%s"' % hashlib.md5(body).hexdigest(), body
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored on both sides
+    opaque = etag.removeprefix("W/")
+    candidates = [t.strip().removeprefix("W/") for t in request.headers.get("if-none-match", "").split(",")]
+    if opaque in candidates or "*" in candidates:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL})
+    return None
+
+def _json_list(listing: Tuple[str, bytes], request: Optional[Request] = None) -> Response:
+    """Answer with a cached listing, or a 304 when the client already holds it"""
+    etag, body = listing
+    if request is not None and (cached := _not_modified(request, etag)) is not None:
+        return cached
+    return Response(content=body, media_type="application/json", headers={"ETag": etag, "Cache-Control": _CACHE_CONTROL})
+
+_INDEXES = [
+    ("project", [("title", "text"), ("summary", "text"), ("tags", "text")], {"default_language": "english"}),
+    ("project", [("title", 1)], {}),
+    ("project", [("phraselist", 1)], {}),
+    ("project", [("tags_lc", 1)], {}),
+    ("project", [("domain", 1), ("year", -1)], {}),
+    ("project", [("year", -1)], {}),
+    ("publication", [("year", -1)], {}),
+    ("blogpost", [("slug", 1)], {}),
+]
+
+@app.on_event("startup")
+async def ensure_indexes():
+    # Best effort: the API must still boot (and answer /livez) without a reachable database
+    if db is None:
+        return
+    for collection_name, keys, options in _INDEXES:
+        try:
+            await db[collection_name].create_index(keys, **options)
+        except ServerSelectionTimeoutError as e:
+            logger.warning("Skipping index creation, database unreachable: %s", e)
+            return
+        except Exception as e:
+            logger.warning("Could not create index %s on %s: %s", keys, collection_name, e)
+    try:
+        await backfill_search_fields("project")
+    except Exception as e:
+        logger.warning("Could not backfill project search fields: %s", e)
 
 @app.get("/")
 def read_root():
     return {"message": "Hello from FastAPI Backend!"}
 
+# Health checks are hit by load balancers and probes, so results are reused briefly
+async def _ping_database() -> bool:
+    if db is None:
+        return False
+    try:
+        await db.command("ping")
+        return True
+    except Exception:
+        return False
+
+@app.get("/livez")
+def liveness():
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readiness():
+    if not await _cached("health:ping", _ping_database):
+        raise HTTPException(status_code=503, detail="Database not reachable")
+    return {"status": "ready"}
+
 @app.get("/test")
-def test_database():
+async def test_database():
+    return await _cached("health:test", _database_status)
+
+async def _database_status():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -38,7 +168,7 @@ def test_database():
             response["database_name"] = getattr(db, 'name', None) or ("✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set")
             response["connection_status"] = "Connected"
             try:
-                response["collections"] = db.list_collection_names()[:10]
+                response["collections"] = (await db.list_collection_names())[:10]
             except Exception as e:
                 response["database"] = f"⚠️ Connected but error: {str(e)[:80]}"
         else:
@@ -47,167 +177,214 @@ def test_database():
         response["database"] = f"❌ Error: {str(e)[:80]}"
     return response
 
-# Seed/sample content endpoints
+# Seed/sample content, validated and BSON-encoded once at import (no timestamps; see encode_documents)
+_SEED_PROJECTS = encode_documents([
+    p.model_dump(mode="json")
+    for p in (
+        Project(
+            title="Customer Churn Prediction",
+            slug="customer-churn-prediction",
+            summary="Predict churn with explainable ML to prioritize retention actions.",
+            domain="ML",
+            stack=["Python", "scikit-learn", "XGBoost", "SHAP"],
+            year=2023,
+            problem="Identify customers likely to churn in the next 60 days.",
+            approach="Feature engineering + gradient boosting with class-weighting and calibration.",
+            dataset="Telco churn dataset + proprietary CRM features.",
+            model="XGBoost with Bayesian optimization; SHAP for interpretability.",
+            results="AUC 0.89, recall 76% at 15% alert rate.",
+            impact="Reduced churn by 5.2% in pilot, saving ~$1.1M ARR.",
+            github_url="https://github.com/",
+            tags=["classification", "retention", "explainability"],
+            plotly_fig={
+                "data": [{"type": "bar", "x": ["Contract", "Tenure", "MonthlyCharges"], "y": [0.34, 0.27, 0.18]}],
+                "layout": {"title": "Top Features (SHAP)"}
+            }
+        ),
+        Project(
+            title="Demand Forecasting with Hierarchical Time Series",
+            slug="demand-forecasting-hts",
+            summary="Weekly forecasts across 120 SKUs with reconciliation and uncertainty.",
+            domain="Time Series",
+            stack=["Python", "Prophet", "statsmodels", "scikit-learn"],
+            year=2022,
+            problem="Improve inventory planning across regions and SKUs.",
+            approach="Feature-rich SARIMAX + gradient boosting for residuals; hierarchical reconciliation.",
+            dataset="Sales transactions 3 years + promo calendar.",
+            model="SARIMAX + LightGBM residual model.",
+            results="MAPE 8.6% overall; stockouts down 23%.",
+            impact="Saved $420k in holding and lost sales.",
+            github_url="https://github.com/",
+            tags=["forecasting", "inventory", "hts"],
+        ),
+        Project(
+            title="Interactive Mobility Dashboard",
+            slug="mobility-dashboard",
+            summary="City mobility patterns explored via interactive geovisualizations.",
+            domain="Visualization",
+            stack=["Python", "Altair", "Deck.gl"],
+            year=2024,
+            problem="Understand peak congestion corridors.",
+            approach="Aggregated GPS pings and derived OD matrices; built interactive views.",
+            dataset="1.2B GPS pings over 6 months.",
+            model="Clustering + KDE for hotspots.",
+            results="Revealed 3 critical choke points.",
+            impact="Informed signal timing policy saving ~8% commute time.",
+            github_url="https://github.com/",
+            tags=["geospatial", "altair", "dashboard"],
+        ),
+    )
+])
+
+_SEED_PUBS = encode_documents([
+    Publication(**pub).model_dump(mode="json")
+    for pub in (
+        {
+            "title": "Storytelling with Data: From Insight to Impact",
+            "venue": "Global Data Summit",
+            "year": 2024,
+            "authors": ["Muhamad Juwandi"],
+            "slides_url": "https://slides.com/",
+            "kind": "talk",
+        },
+        {
+            "title": "Robust ML Pipelines with MLOps",
+            "venue": "PyData",
+            "year": 2023,
+            "authors": ["Muhamad Juwandi"],
+            "slides_url": "https://slides.com/",
+            "kind": "workshop",
+        },
+    )
+])
+
+_SEED_POSTS = encode_documents([
+    BlogPost(**post).model_dump(mode="json")
+    for post in (
+        {
+            "title": "Designing Ethical AI Systems",
+            "slug": "ethical-ai",
+            "excerpt": "Principles and practical checklists for responsible ML.",
+            "body": "Long-form body in Markdown or MDX.",
+            "topics": ["ethics", "ai"],
+            "published_at": "2024-05-11",
+        },
+        {
+            "title": "Visualization Patterns that Clarify",
+            "slug": "viz-patterns",
+            "excerpt": "Choosing encodings that match mental models.",
+            "body": "Post content...",
+            "topics": ["viz", "design"],
+            "published_at": "2024-03-03",
+        },
+        {
+            "title": "From Notebook to Production",
+            "slug": "notebook-to-prod",
+            "excerpt": "A compact guide to MLOps for data scientists.",
+            "body": "Post content...",
+            "topics": ["mlops", "devops"],
+            "published_at": "2023-11-18",
+        },
+        {
+            "title": "R + Python for Analytics",
+            "slug": "r-plus-python",
+            "excerpt": "Leverage strengths of both ecosystems.",
+            "body": "Post content...",
+            "topics": ["r", "python"],
+            "published_at": "2023-07-07",
+        },
+    )
+])
+
+async def _seed_if_empty(collection_name: str, docs: list):
+    if await db[collection_name].estimated_document_count() == 0:
+        await create_documents(collection_name, docs)
+
 @app.post("/seed", tags=["admin"])
 async def seed_content():
     """Seed database with sample projects, publications, and blog posts."""
     if db is None:
         raise HTTPException(status_code=500, detail="Database not configured")
 
-    # Only seed if empty
-    if db["project"].count_documents({}) == 0:
-        samples: List[Project] = [
-            Project(
-                title="Customer Churn Prediction",
-                slug="customer-churn-prediction",
-                summary="Predict churn with explainable ML to prioritize retention actions.",
-                domain="ML",
-                stack=["Python", "scikit-learn", "XGBoost", "SHAP"],
-                year=2023,
-                problem="Identify customers likely to churn in the next 60 days.",
-                approach="Feature engineering + gradient boosting with class-weighting and calibration.",
-                dataset="Telco churn dataset + proprietary CRM features.",
-                model="XGBoost with Bayesian optimization; SHAP for interpretability.",
-                results="AUC 0.89, recall 76% at 15% alert rate.",
-                impact="Reduced churn by 5.2% in pilot, saving ~$1.1M ARR.",
-                github_url="https://github.com/",
-                tags=["classification", "retention", "explainability"],
-                plotly_fig={
-                    "data": [{"type": "bar", "x": ["Contract", "Tenure", "MonthlyCharges"], "y": [0.34, 0.27, 0.18]}],
-                    "layout": {"title": "Top Features (SHAP)"}
-                }
-            ),
-            Project(
-                title="Demand Forecasting with Hierarchical Time Series",
-                slug="demand-forecasting-hts",
-                summary="Weekly forecasts across 120 SKUs with reconciliation and uncertainty.",
-                domain="Time Series",
-                stack=["Python", "Prophet", "statsmodels", "scikit-learn"],
-                year=2022,
-                problem="Improve inventory planning across regions and SKUs.",
-                approach="Feature-rich SARIMAX + gradient boosting for residuals; hierarchical reconciliation.",
-                dataset="Sales transactions 3 years + promo calendar.",
-                model="SARIMAX + LightGBM residual model.",
-                results="MAPE 8.6% overall; stockouts down 23%.",
-                impact="Saved $420k in holding and lost sales.",
-                github_url="https://github.com/",
-                tags=["forecasting", "inventory", "hts"],
-            ),
-            Project(
-                title="Interactive Mobility Dashboard",
-                slug="mobility-dashboard",
-                summary="City mobility patterns explored via interactive geovisualizations.",
-                domain="Visualization",
-                stack=["Python", "Altair", "Deck.gl"],
-                year=2024,
-                problem="Understand peak congestion corridors.",
-                approach="Aggregated GPS pings and derived OD matrices; built interactive views.",
-                dataset="1.2B GPS pings over 6 months.",
-                model="Clustering + KDE for hotspots.",
-                results="Revealed 3 critical choke points.",
-                impact="Informed signal timing policy saving ~8% commute time.",
-                github_url="https://github.com/",
-                tags=["geospatial", "altair", "dashboard"],
-            ),
-        ]
-        for p in samples:
-            create_document("project", p)
-
-    if db["publication"].count_documents({}) == 0:
-        pubs = [
-            {
-                "title": "Storytelling with Data: From Insight to Impact",
-                "venue": "Global Data Summit",
-                "year": 2024,
-                "authors": ["Muhamad Juwandi"],
-                "slides_url": "https://slides.com/",
-                "kind": "talk",
-            },
-            {
-                "title": "Robust ML Pipelines with MLOps",
-                "venue": "PyData",
-                "year": 2023,
-                "authors": ["Muhamad Juwandi"],
-                "slides_url": "https://slides.com/",
-                "kind": "workshop",
-            },
-        ]
-        for pub in pubs:
-            create_document("publication", pub)
-
-    if db["blogpost"].count_documents({}) == 0:
-        posts = [
-            {
-                "title": "Designing Ethical AI Systems",
-                "slug": "ethical-ai",
-                "excerpt": "Principles and practical checklists for responsible ML.",
-                "body": "Long-form body in Markdown or MDX.",
-                "topics": ["ethics", "ai"],
-                "published_at": "2024-05-11",
-            },
-            {
-                "title": "Visualization Patterns that Clarify",
-                "slug": "viz-patterns",
-                "excerpt": "Choosing encodings that match mental models.",
-                "body": "Post content...",
-                "topics": ["viz", "design"],
-                "published_at": "2024-03-03",
-            },
-            {
-                "title": "From Notebook to Production",
-                "slug": "notebook-to-prod",
-                "excerpt": "A compact guide to MLOps for data scientists.",
-                "body": "Post content...",
-                "topics": ["mlops", "devops"],
-                "published_at": "2023-11-18",
-            },
-            {
-                "title": "R + Python for Analytics",
-                "slug": "r-plus-python",
-                "excerpt": "Leverage strengths of both ecosystems.",
-                "body": "Post content...",
-                "topics": ["r", "python"],
-                "published_at": "2023-07-07",
-            },
-        ]
-        for post in posts:
-            create_document("blogpost", post)
+    # Only seed empty collections; the three are independent so seed them concurrently
+    await asyncio.gather(
+        _seed_if_empty("project", _SEED_PROJECTS),
+        _seed_if_empty("publication", _SEED_PUBS),
+        _seed_if_empty("blogpost", _SEED_POSTS),
+    )
+
+    _find_projects.cache_clear()
+    _find_publications.cache_clear()
+    _find_blog_posts.cache_clear()
 
     return {"status": "ok"}
 
-# Public read endpoints
-@app.get("/projects", response_model=List[Project])
-async def list_projects(domain: Optional[str] = None, year: Optional[int] = None, q: Optional[str] = None):
-    if db is None:
-        return []
+# Public read endpoints. Each cached listing carries the ETag of its own body, so a
+# stale entry in one worker can only ever be revalidated against itself.
+def _project_query(domain: Optional[str], year: Optional[int], q: Optional[str]) -> Tuple[dict, list]:
+    """Build the /projects filter and sort; every search clause is backed by an index"""
     query = {}
     if domain:
         query["domain"] = domain
     if year:
         query["year"] = year
+    # Newest first, matching the {domain, year} / {year} indexes
+    sort = [("year", -1)]
     if q:
-        query["$or"] = [
-            {"title": {"$regex": q, "$options": "i"}},
-            {"summary": {"$regex": q, "$options": "i"}},
-            {"tags": {"$regex": q, "$options": "i"}},
-        ]
-    docs = get_documents("project", query)
-    # Coerce to Pydantic
-    return [Project(**{k: v for k, v in d.items() if k != "_id"}) for d in docs]
-
-@app.get("/publications", response_model=List[Publication])
-async def list_publications():
+        if q.endswith("*"):
+            # Prefix search: an anchored regex can still walk the title index
+            query["title"] = {"$regex": "^" + re.escape(q.rstrip("*"))}
+        else:
+            # The text index does the stemmed matching; exact phrases and tags only add hits
+            # Tags can be one word or several, so try each word and each phrase of the query
+            phrases = build_phraselist(q)
+            tag_terms = list(dict.fromkeys([q.strip().lower(), *re.findall(r"\w+", q.lower()), *phrases]))
+            clauses = [{"$text": {"$search": q}}, {"tags_lc": {"$in": tag_terms}}]
+            if phrases:
+                clauses.append({"phraselist": {"$in": phrases}})
+            query["$or"] = clauses
+            sort = [("score", {"$meta": "textScore"})]
+    return query, sort
+
+@alru_cache(maxsize=256, ttl=30)
+async def _find_projects(domain: Optional[str], year: Optional[int], q: Optional[str]) -> Tuple[str, bytes]:
+    query, sort = _project_query(domain, year, q)
+    return _listing(await get_documents("project", query, projection=_PROJECT_FIELDS, sort=sort), _PROJECT_DEFAULTS)
+
+@alru_cache(maxsize=1, ttl=30)
+async def _find_publications() -> Tuple[str, bytes]:
+    return _listing(await get_documents("publication", {}, projection=_PUB_FIELDS, sort=[("year", -1)]), _PUB_DEFAULTS)
+
+@alru_cache(maxsize=1, ttl=30)
+async def _find_blog_posts() -> Tuple[str, bytes]:
+    return _listing(await get_documents("blogpost", {}, projection=_POST_SUMMARY_FIELDS), _POST_SUMMARY_DEFAULTS)
+
+@app.get("/projects", responses={200: {"model": List[Project]}})
+async def list_projects(request: Request, domain: Optional[str] = None, year: Optional[int] = None, q: Optional[str] = None):
+    if db is None:
+        return _json_list(_listing([]))
+    return _json_list(await _find_projects(domain, year, q), request)
+
+@app.get("/publications", responses={200: {"model": List[Publication]}})
+async def list_publications(request: Request):
+    if db is None:
+        return _json_list(_listing([]))
+    return _json_list(await _find_publications(), request)
+
+@app.get("/blog", responses={200: {"model": List[BlogPostSummary]}})
+async def list_blog(request: Request):
     if db is None:
-        return []
-    docs = get_documents("publication", {})
-    return [Publication(**{k: v for k, v in d.items() if k != "_id"}) for d in docs]
+        return _json_list(_listing([]))
+    return _json_list(await _find_blog_posts(), request)
 
-@app.get("/blog", response_model=List[BlogPost])
-async def list_blog():
+@app.get("/blog/{slug}", responses={200: {"model": BlogPost}})
+async def get_blog_post(slug: str):
     if db is None:
-        return []
-    docs = get_documents("blogpost", {})
-    return [BlogPost(**{k: v for k, v in d.items() if k != "_id"}) for d in docs]
+        raise HTTPException(status_code=404, detail="Post not found")
+    post = await db["blogpost"].find_one({"slug": slug}, _POST_FIELDS)
+    if post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post
 
 # Contact form endpoint
 class ContactResponse(BaseModel):
@@ -217,10 +394,19 @@ class ContactResponse(BaseModel):
 async def submit_contact(msg: ContactMessage):
     if db is None:
         raise HTTPException(status_code=500, detail="Database not configured")
-    create_document("contactmessage", msg)
+    await create_document("contactmessage", msg)
     return {"status": "received"}
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Workers need the import string rather than the app object
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+    )
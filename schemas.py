@@ -11,9 +11,15 @@ Model name is converted to lowercase for the collection name:
 - BlogPost -> "blogs" collection
 """
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List, Literal, Dict, Any
 
+def _http_url(v: Optional[str]) -> Optional[str]:
+    # A prefix check is all these links need; HttpUrl runs a full URL parser per field
+    if v is not None and not v.startswith(("http://", "https://")):
+        raise ValueError("URL must start with http:// or https://")
+    return v
+
 # Existing example schemas remain available for reference
 class User(BaseModel):
     name: str = Field(..., description="Full name")
@@ -31,6 +37,8 @@ class Product(BaseModel):
 
 # Portfolio-specific schemas
 class Project(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     title: str
     slug: str
     summary: str
@@ -43,24 +51,38 @@ class Project(BaseModel):
     model: str
     results: str
     impact: str
-    github_url: Optional[HttpUrl] = None
-    demo_url: Optional[HttpUrl] = None
+    github_url: Optional[str] = None
+    demo_url: Optional[str] = None
     tags: List[str] = []
     plotly_fig: Optional[Dict[str, Any]] = Field(
         default=None,
         description="A lightweight Plotly figure specification (data/layout)",
     )
 
+    @field_validator("github_url", "demo_url")
+    @classmethod
+    def _check_urls(cls, v: Optional[str]) -> Optional[str]:
+        return _http_url(v)
+
 class Publication(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     title: str
     venue: str
     year: int
     authors: List[str]
-    link: Optional[HttpUrl] = None
-    slides_url: Optional[HttpUrl] = None
+    link: Optional[str] = None
+    slides_url: Optional[str] = None
     kind: Literal["paper", "talk", "workshop"] = "paper"
 
+    @field_validator("link", "slides_url")
+    @classmethod
+    def _check_urls(cls, v: Optional[str]) -> Optional[str]:
+        return _http_url(v)
+
 class BlogPost(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     title: str
     slug: str
     excerpt: str
@@ -68,7 +90,19 @@ class BlogPost(BaseModel):
     topics: List[str] = []
     published_at: str
 
+class BlogPostSummary(BaseModel):
+    """List view of a BlogPost; the full body is served by /blog/{slug}"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    title: str
+    slug: str
+    excerpt: str
+    topics: List[str] = []
+    published_at: str
+
 class ContactMessage(BaseModel):
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     name: str
     email: str
     message: str
@@ -0,0 +1,139 @@
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+import main
+from database import build_phraselist
+
+
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": headers})
+
+
+# ETag / 304 handling
+
+def test_not_modified_without_header():
+    assert main._not_modified(_request(), 'W/"abc"') is None
+
+
+@pytest.mark.parametrize("header", ['W/"abc"', '"abc"', 'W/"other", W/"abc"', '"x","abc"', "*"])
+def test_not_modified_matches(header):
+    response = main._not_modified(_request(header), 'W/"abc"')
+    assert response is not None
+    assert response.status_code == 304
+    assert response.headers["etag"] == 'W/"abc"'
+
+
+@pytest.mark.parametrize("header", ['W/"abcd"', '"ab"', 'W/"other"'])
+def test_not_modified_mismatch(header):
+    assert main._not_modified(_request(header), 'W/"abc"') is None
+
+
+def test_listing_etag_follows_body():
+    etag, body = main._listing([{"title": "a"}])
+    assert body == b'[{"title":"a"}]'
+    assert etag == main._listing([{"title": "a"}])[0]
+    assert etag != main._listing([{"title": "b"}])[0]
+
+
+def test_listing_fills_missing_optional_fields():
+    _, body = main._listing([{"title": "a", "link": "https://x"}], main._PUB_DEFAULTS)
+    assert b'"link":"https://x"' in body
+    assert b'"slides_url":null' in body
+
+
+# Search routing
+
+def test_phraselist_ngrams():
+    assert build_phraselist("Customer Churn, Prediction!") == [
+        "customer churn", "churn prediction", "customer churn prediction",
+    ]
+    assert build_phraselist("churn") == []
+    assert build_phraselist(None) == []
+
+
+def test_project_query_filters_only():
+    query, sort = main._project_query("ML", 2023, None)
+    assert query == {"domain": "ML", "year": 2023}
+    assert sort == [("year", -1)]
+
+
+def test_project_query_prefix_uses_anchored_title_regex():
+    query, sort = main._project_query(None, None, "Cust*")
+    assert query == {"title": {"$regex": "^Cust"}}
+    assert sort == [("year", -1)]
+
+
+def test_project_query_prefix_escapes_regex():
+    query, _ = main._project_query(None, None, "C++*")
+    assert query["title"]["$regex"] == r"^C\+\+"
+
+
+def test_project_query_single_word_uses_text_and_tags():
+    query, sort = main._project_query(None, None, "Churn")
+    assert query["$or"] == [
+        {"$text": {"$search": "Churn"}},
+        {"tags_lc": {"$in": ["churn"]}},
+    ]
+    assert sort == [("score", {"$meta": "textScore"})]
+
+
+@pytest.mark.parametrize("q", ["ml churn", "predicting churn", "one two three four five six seven"])
+def test_project_query_multi_word_keeps_text_search(q):
+    query, _ = main._project_query(None, None, q)
+    clauses = query["$or"]
+    assert {"$text": {"$search": q}} in clauses
+    assert {"phraselist": {"$in": build_phraselist(q)}} in clauses
+    tags = next(c["tags_lc"]["$in"] for c in clauses if "tags_lc" in c)
+    assert q.split()[0] in tags
+
+
+def test_project_query_matches_multi_word_tags():
+    query, _ = main._project_query("ML", None, "Time Series forecasting")
+    assert query["domain"] == "ML"
+    tags = next(c["tags_lc"]["$in"] for c in query["$or"] if "tags_lc" in c)
+    assert "time series" in tags
+
+
+# Endpoint caching
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    calls = []
+
+    async def fake_get_documents(collection_name, filter_dict=None, limit=None, projection=None, sort=None):
+        calls.append(collection_name)
+        return [{"title": "Talk", "venue": "PyData", "year": 2023, "authors": ["A"], "kind": "talk"}]
+
+    async def noop_seed(collection_name, docs):
+        pass
+
+    monkeypatch.setattr(main, "db", object())
+    monkeypatch.setattr(main, "get_documents", fake_get_documents)
+    monkeypatch.setattr(main, "_seed_if_empty", noop_seed)
+    main._find_publications.cache_clear()
+    yield calls
+    main._find_publications.cache_clear()
+
+
+def test_publications_are_cached_and_revalidated(fake_db):
+    # One client context keeps a single event loop, which the async caches are bound to
+    with TestClient(main.app) as client:
+        first = client.get("/publications")
+        assert first.status_code == 200
+        assert first.json()[0]["link"] is None
+        etag = first.headers["etag"]
+
+        second = client.get("/publications", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+    assert fake_db == ["publication"]
+
+
+def test_seed_clears_list_caches(fake_db):
+    with TestClient(main.app) as client:
+        client.get("/publications")
+        client.get("/publications")
+        assert client.post("/seed").status_code == 200
+        client.get("/publications")
+    assert fake_db == ["publication", "publication"]